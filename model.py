@@ -1,4 +1,5 @@
 from dataclasses import field
+from functools import cached_property
 from pathlib import Path
 
 import kayaku
@@ -7,7 +8,7 @@ from kayaku import config
 kayaku.initialize({"{**}": "./config/{**}"})
 
 
-@config("config")
+@config("config", slots=True)
 class EricConfig:
     """Eric 配置"""
 
@@ -50,7 +51,7 @@ class EricConfig:
     """ 日志文件保留天数 """
 
 
-@config("library.frequency_limit")
+@config("library.frequency_limit", slots=True)
 class FrequencyLimitConfig:
     """频率限制配置"""
 
@@ -67,7 +68,7 @@ class FrequencyLimitConfig:
     """ 全局最大请求权重，为 0 时不限制 """
 
 
-@config("library.function")
+@config("library.function", slots=True)
 class FunctionConfig:
     """功能配置"""
 
@@ -84,7 +85,7 @@ class FunctionConfig:
     """ 命令前缀 """
 
 
-@config("library.data_path")
+@config("library.data_path", slots=True)
 class DataPathConfig:
     library: str = str(Path("data") / "library")
     """ 库数据目录 """
@@ -99,7 +100,7 @@ class DataPathConfig:
     """ 临时文件目录 """
 
 
-@config("library.path")
+@config("library.path", slots=True)
 class PathConfig:
     """路径配置"""
 
@@ -116,7 +117,7 @@ class PathConfig:
     """ 模块配置文件目录 """
 
 
-@config("library.mysql")
+@config("library.mysql", slots=True)
 class MySQLConfig:
     """MySQL 配置"""
 
@@ -143,7 +144,12 @@ class DatabaseConfig:
         SQLite: sqlite+aiosqlite:///data/data.db
     """
 
-    @property
+    def __setattr__(self, name: str, value) -> None:
+        if name == "link":
+            self.__dict__.pop("is_mysql", None)
+        super().__setattr__(name, value)
+
+    @cached_property
     def is_mysql(self) -> bool:
         return self.link.startswith("mysql+aiomysql://")
 
@@ -1,29 +1,29 @@
 import dataclasses
+import functools
 import inspect
+import itertools
 from contextvars import ContextVar
 from dataclasses import _MISSING_TYPE  # noqa
-from typing import Callable, Coroutine, cast
+from typing import TYPE_CHECKING, Callable, Coroutine, Iterator, cast
 
 import kayaku
 import typing_extensions
 from kayaku.schema_gen import ConfigModel
-from rich.markdown import Markdown
 from rich.text import Text
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container
-from textual.reactive import reactive
 from textual.screen import Screen
 from textual.widget import Widget
 from textual.widgets import Button, Footer, Header, Input, Static
 from typing_extensions import Self
 
+import model as _model  # noqa: F401
 from util import type_cast
 
-__import__("model")
+if TYPE_CHECKING:
+    from rich.markdown import Markdown
 
-CURRENT_SCREEN = ContextVar("CURRENT_SCREEN", default="")
-INSTALLED_SCREENS = ContextVar("INSTALLED_SCREENS", default=[])
 TUI_APP = ContextVar("TUI_APP")
 
 _T = typing_extensions.TypeVar("_T")
@@ -44,12 +44,22 @@ _NO_MODELS_MD = """
 """
 
 
+@functools.lru_cache(maxsize=None)
+def _markdown(text: str) -> "Markdown":
+    from rich.markdown import Markdown
+
+    return Markdown(text, justify="center")
+
+
 def merge_classes(*classes: str) -> str:
+    seen = set()
     cls = []
     for c in classes:
         if c and isinstance(c, str):
-            cls.extend(c.split())
-    cls = [{c for c in cls if c}]
+            for token in c.split():
+                if token not in seen:
+                    seen.add(token)
+                    cls.append(token)
     return " ".join(cls)
 
 
@@ -76,8 +86,8 @@ class MessageBox(Container):
             return
         if event.button.id == self._button.id and self._button_callback:
             obj = self._button_callback()
-            while inspect.isawaitable(obj):
-                obj = await obj
+            if inspect.isawaitable(obj):
+                await obj
 
 
 class FallbackScreen(Screen):
@@ -85,7 +95,7 @@ class FallbackScreen(Screen):
         yield Header()
         yield Center(
             MessageBox(
-                Static(Markdown(_NO_MODELS_MD, justify="center")),
+                Static(_markdown(_NO_MODELS_MD)),
                 Button("退出", id="fallback_exit", variant="error"),
                 self.app.action_quit,
                 classes="fallback",
@@ -112,15 +122,12 @@ class InputField(Container):
         self.data = ""
 
     def compose(self) -> ComposeResult:
-        container = [
-            InputPair(
-                Static(self._field_label, classes="label"),
-                Input(placeholder=self._field_placeholder),
-            )
-        ]
+        yield InputPair(
+            Static(self._field_label, classes="label"),
+            Input(placeholder=self._field_placeholder),
+        )
         if self._field_description:
-            container.append(Static(self._field_description, classes="description"))
-        yield from container
+            yield Static(self._field_description, classes="description")
 
     def on_input_changed(self, message: Input.Changed) -> None:
         self.data = message.value
@@ -152,7 +159,7 @@ class MutableInputPair(Container):
 
 class MutableInputField(Container):
     data: list[_T]
-    _widgets: reactive[dict[str, Widget]] = reactive({}, layout=True)
+    _widgets: list[Widget | None]
     _input: str
 
     @property
@@ -164,27 +171,28 @@ class MutableInputField(Container):
     ):
         super().__init__(classes=classes)
         self._field_classes = classes
+        self._input_class = f"{self.button_id_prefix}_input"
+        self._add_id = f"{self.button_id_prefix}_add"
+        self._remove_prefix = f"{self.button_id_prefix}_remove_"
         self._field_label = label
         self._field_placeholder = placeholder
         self._field_description = description
         self._field_typ = typ
         self.data = []
+        self._widgets = []
         self._input = ""
 
     def compose(self) -> ComposeResult:
-        container = [
-            MutableInputPair(
-                Static(self._field_label, classes="label"),
-                Input(
-                    placeholder=self._field_placeholder,
-                    classes=f"{self.button_id_prefix}_input",
-                ),
-                Button("+", id=f"{self.button_id_prefix}_add", variant="primary"),
-            )
-        ]
+        yield MutableInputPair(
+            Static(self._field_label, classes="label"),
+            Input(
+                placeholder=self._field_placeholder,
+                classes=self._input_class,
+            ),
+            Button("+", id=self._add_id, variant="primary"),
+        )
         if self._field_description:
-            container.append(Static(self._field_description, classes="description"))
-        yield from container
+            yield Static(self._field_description, classes="description")
 
     def on_input_changed(self, message: Input.Changed) -> None:
         self._input = message.value
@@ -205,7 +213,7 @@ class MutableInputField(Container):
         if not self._input:
             self.screen.mount(ErrorBox("输入不能为空"))
             return
-        index = len(self.data) + 1
+        index = len(self._widgets)
         try:
             value = self.type_cast()
         except (NotImplementedError, ValueError):
@@ -214,28 +222,27 @@ class MutableInputField(Container):
             pair := MutableInputPair(
                 Static("", classes="label"),
                 FrozenInput(self._input),
-                Button(
-                    "-", id=f"{self.button_id_prefix}_remove_{index}", variant="error"
-                ),
+                Button("-", id=f"{self._remove_prefix}{index}", variant="error"),
                 classes=f"{self._field_classes}_data_{index} _margin-top",
             )
         )
         self.data.append(value)
-        self._widgets[str(index)] = pair
+        self._widgets.append(pair)
         self._input = ""
-        box = self.query_one(f".{self.button_id_prefix}_input")
+        box = self.query_one(f".{self._input_class}")
         box.value = ""
 
     def on_button_pressed(self, event: Button.Pressed):
-        if not event.button.id or not event.button.id.startswith(self.button_id_prefix):
+        button_id = event.button.id
+        if not button_id:
             return
-        if event.button.id.startswith(f"{self.button_id_prefix}_remove"):
-            index = event.button.id.split("_")[-1]
-            if index in self._widgets:
-                self._widgets[index].remove()
-                del self._widgets[index]
-            return
-        self.append()
+        if button_id == self._add_id:
+            self.append()
+        elif button_id.startswith(self._remove_prefix):
+            index = int(button_id[len(self._remove_prefix) :])
+            if (pair := self._widgets[index]) is not None:
+                pair.remove()
+                self._widgets[index] = None
 
     def on_input_submitted(self):
         self.append()
@@ -271,37 +278,45 @@ class KayakuScreen(Screen):
     def assemble_description(required: bool, docs: str, hint: str) -> Text:
         if not required and not docs:
             return Text(hint, style="bold green")
-        require_prefix = ("*必填 ", "bold red") if required else ""
-        return Text.assemble(
-            require_prefix, docs, "\n\n", "@type: ", (hint, "bold green")
-        )
+        text = Text()
+        if required:
+            text.append("*必填 ", style="bold red")
+        text.append(docs)
+        text.append("\n\n@type: ")
+        text.append(hint, style="bold green")
+        return text
 
     @classmethod
-    def from_model(cls, model: type) -> Self:
-        model = cast(ConfigModel, model)
-        components: list[Widget] = [
-            ContainerTitle(Static(model.__name__, classes="kayaku-model-name"))
-        ]
+    @functools.lru_cache(maxsize=None)
+    def schema_for(cls, model: type) -> tuple[tuple[str, str, Text, type, type], ...]:
         type_hints = typing_extensions.get_type_hints(model, include_extras=True)
+        schema = []
         for field in dataclasses.fields(model):  # noqa
             typ = type_hints[field.name]
-            hint = (
-                f"{typ!r}"
-                if (typ_origin := typing_extensions.get_origin(typ))
-                else f"{typ.__name__}"
-            )
+            typ_origin = typing_extensions.get_origin(typ)
+            hint = f"{typ!r}" if typ_origin else f"{typ.__name__}"
             child_type = child[0] if (child := typing_extensions.get_args(typ)) else typ
             docs = field.metadata.get("description", "")
             desc = cls.assemble_description(cls.is_required_field(field), docs, hint)
-            if field.default == "":
-                default = "<未设置>"
-            elif isinstance(field.default, _MISSING_TYPE):
+            if isinstance(field.default, _MISSING_TYPE):
                 default = ""
+            elif field.default == "":
+                default = "<未设置>"
             else:
                 default = field.default
             input_field = MutableInputField if typ_origin == list else InputField
+            schema.append((field.name, str(default), desc, input_field, child_type))
+        return tuple(schema)
+
+    @classmethod
+    def from_model(cls, model: type) -> Self:
+        model = cast(ConfigModel, model)
+        components: list[Widget] = [
+            ContainerTitle(Static(model.__name__, classes="kayaku-model-name"))
+        ]
+        for name, default, desc, input_field, child_type in cls.schema_for(model):
             components.append(
-                input_field(model.__name__, f"{field.name}", str(default), desc, typ=child_type)
+                input_field(model.__name__, name, default, desc, typ=child_type)
             )
         return cls(model, Header(), Body(quick_access, *components), Footer())
 
@@ -319,8 +334,8 @@ class ContainerTitle(Container):
 
 
 class QuickAccess(Container):
-    def reg_screen(self, screen: str):
-        self.mount(ScreenLink(screen, screen))
+    def reg_screens(self, screens: list[str]):
+        self.mount(*(ScreenLink(screen, screen) for screen in screens))
 
 
 class Notification(Static):
@@ -353,13 +368,15 @@ class EricTUI(App):
         Binding("ctrl+c", "quit", "退出", priority=True),
         ("s", "save", "保存"),
     ]
+    _pending_models: dict[str, type]
+    _screen_cycle: Iterator[str]
 
     def compose(self) -> ComposeResult:
         mount_screens(self)
         yield Header()
         yield Center(
             MessageBox(
-                Static(Markdown(_WELCOME_MD, justify="center")),
+                Static(_markdown(_WELCOME_MD)),
                 Button("开始", id="welcome_start", variant="success"),
                 self.app.action_next_screen,
                 classes="welcome",
@@ -368,14 +385,13 @@ class EricTUI(App):
         yield Footer()
 
     def action_next_screen(self):
-        if not CURRENT_SCREEN.get():
-            CURRENT_SCREEN.set(INSTALLED_SCREENS.get()[0])
-        else:
-            screens = INSTALLED_SCREENS.get()
-            index = screens.index(CURRENT_SCREEN.get())
-            count = len(screens)
-            CURRENT_SCREEN.set(screens[(index + 1) % count])
-        self.push_screen(CURRENT_SCREEN.get())
+        self.push_screen(next(self._screen_cycle))
+
+    def push_screen(self, screen: Screen | str):
+        if isinstance(screen, str) and screen in self._pending_models:
+            model = self._pending_models.pop(screen)
+            self.install_screen(KayakuScreen.from_model(model), screen)
+        return super().push_screen(screen)
 
     def action_save(self):
         kayaku.save_all()
@@ -386,17 +402,14 @@ class EricTUI(App):
 def mount_screens(__app):
     from kayaku.domain import _store  # noqa
 
-    installed = []
+    __app._pending_models = {cls.__name__: cls for cls in _store.cls_domains.keys()}
+    installed = list(__app._pending_models)
     quick_access.mount(Static("快速访问", classes="quick-access-panel"))
-    for cls in _store.cls_domains.keys():
-        __app.install_screen(KayakuScreen.from_model(cls), cls.__name__)
-        quick_access.reg_screen(cls.__name__)
-        installed.append(cls.__name__)
     if not installed:
         __app.install_screen(FallbackScreen(), "Fallback")
-        quick_access.reg_screen("Fallback")
         installed.append("Fallback")
-    INSTALLED_SCREENS.set(installed)
+    quick_access.reg_screens(installed)
+    __app._screen_cycle = itertools.cycle(installed)
 
 
 if __name__ == "__main__":
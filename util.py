@@ -1,22 +1,21 @@
-import re
-
 from typing import Callable, TypeVar
 
 _T = TypeVar("_T")
 
+_BOOL_SET = frozenset(("True", "False", "true", "false"))
+_BOOL_TRUE = frozenset(("True", "true"))
+
+
+def _is_float(x: str) -> bool:
+    integer, _, fraction = x.partition(".")
+    return integer.isdigit() and fraction.isdigit()
 
-VALIDATOR: dict[type[_T], Callable[[str], bool]] = {
-    str: lambda x: True,
-    int: lambda x: x.isdigit(),
-    float: lambda x: re.match(r"^\d+\.\d+$", x) is not None,
-    bool: lambda x: x in {"True", "False", "true", "false"},
-}
 
-CASTER: dict[type[_T], Callable[[str], _T]] = {
-    str: lambda x: x,
-    int: lambda x: int(x),
-    float: lambda x: float(x),
-    bool: lambda x: x.lower() == "true",
+_DISPATCH: dict[type[_T], tuple[Callable[[str], bool], Callable[[str], _T]]] = {
+    str: (lambda _: True, str),
+    int: (str.isdigit, int),
+    float: (_is_float, float),
+    bool: (_BOOL_SET.__contains__, _BOOL_TRUE.__contains__),
 }
 
 
@@ -35,10 +34,12 @@ def type_cast(value: str, typ: type[_T]) -> _T:
         NotImplementedError: 不支持的类型
         ValueError: 值不合法
     """
-    if isinstance(value, typ):
+    if type(value) is typ:
         return value
-    if typ not in VALIDATOR:
+    entry = _DISPATCH.get(typ)
+    if entry is None:
         raise NotImplementedError(f"Type {typ} is not supported")
-    if not VALIDATOR[typ](value):
+    validator, caster = entry
+    if not validator(value):
         raise ValueError(f"Invalid value for {typ}: {value}")
-    return CASTER[typ](value)
+    return caster(value)